@@ -0,0 +1,71 @@
+"""
+Compiled quantity_rules against the hand-written cascade they replaced, and
+normalize + case sensitive patterns against the IGNORECASE patterns on raw
+text, over the test titles as-is and as scraped (NBSP, thin spaces, ™,
+fullwidth digits).
+
+    python benchmarks/bench_quantity.py
+"""
+
+import logging
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cascade import quantity_cascade  # noqa: E402
+from corpus import quantity_rules_corpus  # noqa: E402
+
+from unitparsing_pkg.prices import UnitPrice, _compile_quantity  # noqa: E402
+
+logging.disable(logging.CRITICAL)
+
+FULLWIDTH = {ord(d): chr(ord(d) + 0xFEE0) for d in "0123456789"}
+
+
+def scraped(text, i):
+    """Every other title picks up the noise seen in scraped feeds"""
+    if i % 2:
+        return text
+    if i % 4 == 0:
+        return text.replace(" ", "\u00a0") + "™"
+    return text.replace(" ", "\u2009").translate(FULLWIDTH)
+
+
+def run(fn, corpus):
+    for text in corpus:
+        try:
+            fn(text)
+        except Exception:
+            pass
+
+
+def bench(name, fn, corpus, number=200, repeat=5):
+    best = min(timeit.repeat(lambda: run(fn, corpus), number=number, repeat=repeat))
+    per_call = best / (number * len(corpus)) * 1e6
+    print(f"{name:>20}: {per_call:.2f} us/call")
+    return per_call
+
+
+if __name__ == "__main__":
+    ignorecase_rules = [
+        rule._replace(
+            pattern=re.compile(rule.pattern.pattern, rule.pattern.flags | re.IGNORECASE)
+        )
+        for rule in UnitPrice.quantity_rules
+    ]
+    ignorecase, _, _ = _compile_quantity(ignorecase_rules, UnitPrice.quantity_units)
+    normalized = UnitPrice._compile()[0]
+
+    ascii_corpus = [t for t in quantity_rules_corpus if isinstance(t, str)]
+    mixed_corpus = [scraped(t, i) for i, t in enumerate(ascii_corpus)]
+
+    for label, corpus in (("ascii", ascii_corpus), ("mixed", mixed_corpus)):
+        print(f"{len(corpus)} {label} titles")
+        cascade = bench("cascade", quantity_cascade, corpus)
+        before = bench("compiled ignorecase", ignorecase, corpus)
+        after = bench("normalize+compiled", normalized, corpus)
+        print(f"{cascade / after:.2f}x cascade, {before / after:.2f}x ignorecase")
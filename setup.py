@@ -19,4 +19,8 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     python_requires=">=3.8",
+    extras_require={
+        "arrow": ["pyarrow"],
+        "pandas": ["pandas>=2", "pyarrow"],
+    },
 )
@@ -0,0 +1,188 @@
+"""
+Titles the compiled quantity rules are checked against tests/cascade.py with,
+also the corpus for benchmarks/bench_quantity.py.
+"""
+
+quantity_rules_corpus = [
+    "fl.oz",
+    "Signature Farms Hass Avocados - 6 Count",
+    "Adams 16 Ounce Creamy Peanu Butter",
+    "Whole Foods Market™ Organic Pine Nuts, 4 oz",
+    "Mission White Corn Tortillas - 30 Count",
+    " POUND ",
+    " 100 pack ",
+    "100pack",
+    "100 pk",
+    "2 ct",
+    "1 ct",
+    "1/2ct",
+    "1/8count",
+    "Coast Style Clam Chowder Soup 1/2 count 3/4 count",
+    "Pacific Coast Style Clam Chowder Soup 1/2 count",
+    "Pacific Coast Style Clam Chowder Soup 1/2ct",
+    "Pacific Coast Style Clam Chowder Soup - 23ct",
+    "Pacific Coast Style Clam Chowder Soup - 23ct ",
+    "Pacific Coast Style Clam Chowder Soup - 23 ct",
+    "De Nigris Vinegar Balsamic Bronze Eagle - 16.9 Fl. Oz.",
+    "Fairlife Milk Ultra-Filtered Whole - 52 Fl. Oz.",
+    "FlOz",
+    "Fl.Oz",
+    "Fl.Oz.",
+    "Seedless Mini Watermelon - 12 Each 13ea ",
+    "Seedless Mini Watermelon - 12 Each 13 each",
+    "Seedless Mini Watermelon - 12 Each",
+    "Seedless Mini Watermelon - Each",
+    "1.3 ea",
+    "1 each",
+    "each",
+    "1each",
+    "0.5pk",
+    "100 pk",
+    "1/2 pk",
+    ".3pack ",
+    "1/2 pack ",
+    "Signature Cafe Pacific Coast Style Clam Chowder Soup - 24 Oz.",
+    "Azumaya Tofu Extra Firm - 14 Oz",
+    "Squid Whole Raw Frozen - 3.00Lb",
+    "Squid Whole Raw Frozen - 3.00 LB",
+    "Squid Whole Raw Frozen3.00Lb",
+    "ham sandwich 4 ct/15.25 oz",
+    "4 ct/15.25 oz",
+    "4 ct / 15.25 oz",
+    "1 lb",
+    "1/2 lb",
+    "1/2 oz ",
+    "1/2 / lb",
+    "1/2 /lb",
+    "10 oz",
+    "10 Oz",
+    "10.5 oz",
+    "14.75 oz",
+    "16 ct / 40 oz",
+    "24 ct / 50.8 oz",
+    "1 pint",
+    "1  pint ",
+    "1 pt",
+    "1pint ",
+    "3.5 1/2 pints",
+    "3.5 1/2 pt",
+    "3/4 1/2 pt",
+    "3 1/2 pt",
+    "1/2pt",
+    "1/2 pt",
+    "1 quart",
+    "1  quart ",
+    "1 qt",
+    "2.19 qt",
+    "2.19 qts",
+    "1quart ",
+    "3.5 1/2 quarts",
+    "3.5 1/2 qt",
+    "3/4 1/2 qt",
+    "3 1/2 qt",
+    "1/2qt",
+    "1/2 qt",
+    "1 gallon",
+    "1  gallon ",
+    "1 gal",
+    "1gallon ",
+    "3.5 1/2 gallons",
+    "3.5 1/2 gal",
+    "3/4 1/2 gal",
+    "3 1/2 gal",
+    "1/2gal",
+    "1/2 gal",
+    "250ML",
+    "250 ml",
+    "Lawry's Signature Steakhouse Marinade - 12oz",
+    "Frozen Chicken Breast Tenderloins - 2.5lbs - Archer Farms™",
+    "Vegan Peach Ginger Kombucha - 15.2oz",
+    "Land O' Lakes Mini Half & Half - Serve Pods - 192ct/54 fl oz",
+    "B-Tea Raw & Organic Green Tea - 6pk/16 fl oz Bottles",
+    "oZ   ",
+    "  LB   ",
+    "  gallons   ",
+    "floz",
+    "fl oz",
+    "fl  oz",
+    "fl  oz   ",
+    "  fl  oz   ",
+    "  fl    oz   ",
+    "flgal",
+    "fl gal",
+    "fl  gal",
+    "fl  gal   ",
+    "  fl  gal   ",
+    "  fl    gal   ",
+    "fl.gal",
+    "  fl.  gal   ",
+    "  fl.    gal   ",
+    "  fl.  oz   ",
+    "  fl.    oz   ",
+    "DRPT",
+    "DR.PT.",
+    "DR. PT.",
+    " DR.PT.",
+    "DR.PT",
+    "DR-PT",
+    "($1.33 / Count)",
+    " 0.49/pound ",
+    " .49/pound ",
+    " Price.49/lb ",
+    " Price .49/lb ",
+    " .49/lb ",
+    " 49¢/lb ",
+    " 49¢ /lb ",
+    " Price 49¢ /lb ",
+    "1.99/bunch",
+    "$7.99 / 300 ML",
+    "$14.69 / 250 ML",
+    "4.99/100 pk",
+    "2.69/2 count",
+    "2.69/2 count",
+    "2.19/qt",
+    "5.49per pt",
+    "5.49 per pt",
+    "5.49 // pt",
+    "5.49 - oz",
+    "5.49 / pt",
+    "5.49 / pint",
+    "5.49 / oz",
+    "1.67/OUNCE",
+    "5.49/lb",
+    "5.49 each",
+    "5.49 / each",
+    "$5.49 / each",
+    "5.49 /EACH",
+    "5/EACH",
+    "1.99/lb",
+    "(2.29/lb)",
+    "( 2.29 /lb)",
+    "24.99/96 oz",
+    " / oz",
+    "/ oz",
+    "5.49 / ",
+    " oZ ",
+    "LB",
+    " LB ",
+    " Gal ",
+    None,
+    1.3,
+    "",
+    "4 ct / 15.25 oz 5 ct / 15.25 oz",
+    "1/2/lb",
+    "1/0 lb",
+    "1. lb",
+    ". lb",
+    "1.2.3 oz",
+    "１２ oz",
+    "3 half gal",
+    "half gallon",
+    "Soda - 15-11 Fl Oz cans",
+    "Soda - 6-11.2 Fl. Oz.",
+    "3 cans / 23 fl oz",
+    "6 Count/11 Fl Oz",
+    "10 bunch",
+    "10/bunch",
+    "2 1/2 ml",
+]
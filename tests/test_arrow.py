@@ -0,0 +1,67 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from unitparsing_pkg.arrow import quantity_array, unit_price_array
+
+
+def test_quantity_array():
+    result = quantity_array(pa.array(["1/2 / lb", "4 ct / 15.25 oz", "1/2 / lb"]))
+    assert result.to_pylist() == [
+        {"amount": 8.0, "unit": "oz", "status": "ok"},
+        {"amount": 61.0, "unit": "oz", "status": "ok"},
+        {"amount": 8.0, "unit": "oz", "status": "ok"},
+    ]
+
+
+def test_quantity_array_nulls_stay_null():
+    result = quantity_array(pa.array([None, "1 lb", None]))
+    assert result.null_count == 2
+    assert result.to_pylist() == [
+        None,
+        {"amount": 16.0, "unit": "oz", "status": "ok"},
+        None,
+    ]
+
+
+def test_quantity_array_failures_have_status():
+    result = quantity_array(pa.array(["1.3 easter egg", "1/2/lb"]))
+    assert [r["status"] for r in result.to_pylist()] == ["no_match", "bad_number"]
+    assert result.null_count == 0
+
+
+def test_quantity_array_chunked():
+    result = quantity_array(pa.chunked_array([["1 lb"], [None, "2 oz"]]))
+    assert isinstance(result, pa.ChunkedArray)
+    assert result.num_chunks == 2
+    assert result.to_pylist() == [
+        {"amount": 16.0, "unit": "oz", "status": "ok"},
+        None,
+        {"amount": 2.0, "unit": "oz", "status": "ok"},
+    ]
+
+
+def test_quantity_array_dictionary_input():
+    values = pa.array(["1 lb", None, "1 lb"]).dictionary_encode()
+    assert quantity_array(values).to_pylist() == quantity_array(
+        pa.array(["1 lb", None, "1 lb"])
+    ).to_pylist()
+
+
+def test_unit_price_array():
+    result = unit_price_array(pa.array(["1.99/bunch", None, " oZ "]))
+    assert result.to_pylist() == [
+        {"amount": 1.99, "unit": "bunch", "status": "ok"},
+        None,
+        {"amount": None, "unit": None, "status": "no_match"},
+    ]
+
+
+def test_pandas_accessor():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"title": ["1 lb", None]}, index=[10, 20])
+    result = df["title"].unitparse.quantity()
+    assert list(result.index) == [10, 20]
+    assert result[10] == {"amount": 16.0, "unit": "oz", "status": "ok"}
+    assert pd.isna(result[20])
+    assert df.unitparse.quantity("title").equals(result)
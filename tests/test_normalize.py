@@ -0,0 +1,42 @@
+import pytest
+
+from unitparsing_pkg.normalize import normalize, normalize_offsets
+
+test_normalize_parameter_list = [
+    ("", ""),
+    ("1/2 LB", "1/2 lb"),
+    ("  keeps   ascii  spacing ", "  keeps   ascii  spacing "),
+    ("12\u00a0oz", "12 oz"),
+    ("12\u00a0\u2009 oz", "12 oz"),
+    ("Whole Foods Market™ Organic Pine Nuts, 4 oz", "whole foods market organic pine nuts, 4 oz"),
+    ("１２ ＯＺ", "12 oz"),
+    ("49¢/lb", "49¢/lb"),
+    ("½ lb", ".5 lb"),
+    ("1½ lb", "1.5 lb"),
+    ("2¾ qt", "2.75 qt"),
+    ("1 ½ lb", "1.5 lb"),
+    ("2\u00a0½ qt", "2.5 qt"),
+    ("１２ ¼ oz", "12.25 oz"),
+    ("1\u20442 lb", "1/2 lb"),
+    ("Soda – 15–11 Fl Oz", "soda - 15-11 fl oz"),
+    ("fl\u200b oz", "fl oz"),
+]
+
+
+@pytest.mark.parametrize("test_input,expected", test_normalize_parameter_list)
+def test_normalize(test_input, expected):
+    assert normalize(test_input) == expected
+
+
+def test_normalize_ascii_is_only_lowercased():
+    text = "Squid Whole Raw Frozen\t- 3.00 LB"
+    assert normalize(text) == text.lower()
+
+
+@pytest.mark.parametrize("test_input,expected", test_normalize_parameter_list)
+def test_normalize_offsets(test_input, expected):
+    text, offsets = normalize_offsets(test_input)
+    assert text == expected
+    assert len(offsets) == len(text)
+    assert list(offsets) == sorted(offsets)
+    assert all(0 <= i < len(test_input) for i in offsets)
@@ -1,7 +1,14 @@
+import logging
+
 import pytest
+from corpus import quantity_rules_corpus
 
-from unitparsing_pkg.prices import (Bundle, CaculateUnitPriceException,
-                                    ParseQuantityException, UnitPrice)
+from unitparsing_pkg.normalize import normalize
+from unitparsing_pkg.prices import (REASON_BAD_NUMBER, REASON_NO_MATCH,
+                                    REASON_NOT_STRING, REASON_OK, Bundle,
+                                    CaculateUnitPriceException, FailureSample,
+                                    ParseQuantityException, ParseResult,
+                                    UnitPrice)
 
 test_quantity_parameter_list_expected_fail_list = [
     ("fl.gal", (128, "oz")),
@@ -237,3 +244,230 @@ def test_getting_quantity_from_empty_string():
 def test_quantity_with_assert_equals():
     with pytest.raises(ParseQuantityException):
         UnitPrice.quantity("1.3 cantspell")
+
+
+@pytest.mark.parametrize("test_input,expected", test_quantity_parameter_list)
+def test_try_quantity_matches_quantity(test_input, expected):
+    result = UnitPrice.try_quantity(test_input)
+    assert result.ok
+    assert result.value == UnitPrice.quantity(test_input)
+
+
+@pytest.mark.parametrize(
+    "test_input,reason",
+    [
+        ("1.3 easter egg", REASON_NO_MATCH),
+        (None, REASON_NO_MATCH),
+        (1.3, REASON_NOT_STRING),
+        ("1/2/lb", REASON_BAD_NUMBER),
+        ("fl.gal", REASON_BAD_NUMBER),
+    ],
+)
+def test_try_quantity_reason(test_input, reason):
+    assert UnitPrice.try_quantity(test_input) == ParseResult(None, reason)
+
+
+@pytest.mark.parametrize("test_input,expected", test_unit_price_parameter_list)
+def test_try_unit_price(test_input, expected):
+    assert UnitPrice.try_unit_price(test_input) == ParseResult(expected, REASON_OK)
+
+
+@pytest.mark.parametrize("test_input", unit_price_will_fail_list)
+def test_try_unit_price_fails(test_input):
+    assert UnitPrice.try_unit_price(test_input) == ParseResult(None, REASON_NO_MATCH)
+
+
+def test_try_quantities_fills_failure_sample():
+    failures = FailureSample(3, seed=1)
+    texts = ["1 lb", "junk"] * 10
+    results = UnitPrice.try_quantities(texts, failures)
+    assert [r.ok for r in results] == [True, False] * 10
+    assert failures.seen == 10
+    assert failures.items == [("junk", REASON_NO_MATCH)] * 3
+
+
+def test_try_unit_prices():
+    failures = FailureSample()
+    results = UnitPrice.try_unit_prices(["5.49/lb", " oZ "], failures)
+    assert results == [
+        ParseResult((5.49 / 16, "oz"), REASON_OK),
+        ParseResult(None, REASON_NO_MATCH),
+    ]
+    assert failures.items == [(" oZ ", REASON_NO_MATCH)]
+
+
+def _noisy(text):
+    """The same title as scraped: NBSP, fullwidth digits and a trademark"""
+    digits = {ord(d): chr(ord(d) + 0xFEE0) for d in "0123456789"}
+    return text.replace(" ", "\u00a0").translate(digits) + "™"
+
+
+test_iter_quantities_parameter_list = (
+    test_quantity_parameter_list
+    + [(_noisy(t), expected) for t, expected in test_quantity_parameter_list]
+    + [
+        ("1½ lb", (24, "oz")),
+        ("1 ½ lb", (24, "oz")),
+        ("１２ ＯＺ", (12, "oz")),
+        ("Soda – 15–11 Fl Oz cans", (165, "oz")),
+        ("4 ct ⁄ 15.25 oz", (61, "oz")),
+    ]
+)
+
+
+@pytest.mark.parametrize("test_input,expected", test_iter_quantities_parameter_list)
+def test_iter_quantities_first_matches_quantity(test_input, expected):
+    amount, unit = expected[0], expected[1]
+    found = next(UnitPrice.iter_quantities(test_input))
+    assert found.value == Bundle(amount, unit)
+    assert found.value == UnitPrice.quantity(test_input)
+
+
+@pytest.mark.parametrize("test_input", ["3 PİNT", "3 lbſ"])
+def test_iter_quantities_case_folding_mismatch(test_input):
+    assert list(UnitPrice.iter_quantities(test_input)) == []
+
+
+def test_iter_quantities_finds_every_quantity():
+    text = "4 ct / 15.25 oz 5 ct / 15.25 oz"
+    found = list(UnitPrice.iter_quantities(text))
+    assert [f.value for f in found] == [Bundle(61, "oz"), Bundle(76.25, "oz")]
+    assert [text[slice(*f.span)] for f in found] == ["4 ct / 15.25 oz", "5 ct / 15.25 oz"]
+    assert [f.pattern for f in found] == ["pat_can", "pat_can"]
+
+
+def test_iter_quantities_is_lazy():
+    found = UnitPrice.iter_quantities("Seedless Mini Watermelon - 12 Each 13ea ")
+    assert next(found).value == Bundle(12, "each")
+    assert next(found).value == Bundle(13, "each")
+    with pytest.raises(StopIteration):
+        next(found)
+
+
+def test_iter_quantities_skips_bad_numbers():
+    found = list(UnitPrice.iter_quantities("1/2/lb then 3 oz"))
+    assert [f.value for f in found] == [Bundle(3, "oz")]
+
+
+def test_iter_quantities_nothing_found():
+    assert list(UnitPrice.iter_quantities("1.3 easter egg")) == []
+    assert list(UnitPrice.iter_quantities(None)) == []
+
+
+def test_all_quantities():
+    found = UnitPrice.all_quantities(["12 Each 13ea", "junk", "1 lb"])
+    assert [[f.value for f in row] for row in found] == [
+        [Bundle(12, "each"), Bundle(13, "each")],
+        [],
+        [Bundle(16, "oz")],
+    ]
+
+
+def _outcome(fn, text):
+    """(amount, unit) or the name of the exception raised"""
+    try:
+        result = fn(text)
+    except Exception as e:
+        return type(e).__name__
+    return result.amount, result.unit
+
+
+@pytest.mark.parametrize("test_input", quantity_rules_corpus)
+def test_compiled_rules_match_hand_written_cascade(test_input):
+    from cascade import quantity_cascade
+
+    assert _outcome(UnitPrice.quantity, test_input) == _outcome(
+        quantity_cascade, test_input
+    )
+
+
+@pytest.mark.parametrize("test_input,expected", test_quantity_parameter_list)
+def test_quantity_normalizes_noisy_input(test_input, expected):
+    amount, unit = expected[0], expected[1]
+    assert Bundle(amount, unit) == UnitPrice.quantity(_noisy(test_input))
+
+
+@pytest.mark.parametrize("test_input,expected", test_unit_price_parameter_list)
+def test_unit_price_normalizes_noisy_input(test_input, expected):
+    assert UnitPrice.unit_price(_noisy(test_input)) == expected
+
+
+def test_quantity_unicode_fractions():
+    assert Bundle(24, "oz") == UnitPrice.quantity("1½ lb")
+    assert Bundle(8, "oz") == UnitPrice.quantity("½ lb")
+    assert Bundle(8, "oz") == UnitPrice.quantity("1⁄2 lb")
+
+
+def test_quantity_unicode_mixed_numbers():
+    assert Bundle(24, "oz") == UnitPrice.quantity("1 ½ lb")
+    assert Bundle(80, "oz") == UnitPrice.quantity("2 ½ qt")
+    assert Bundle(80, "oz") == UnitPrice.quantity("2\u00a0½ qt")
+
+
+def test_subclass_rules_compile_separately():
+    class Pounds(UnitPrice):
+        quantity_rules = tuple(
+            r._replace(name="pounds") for r in UnitPrice.quantity_rules if r.name == "pat_lb"
+        )
+
+    assert list(UnitPrice.iter_quantities("1 lb 2 ct"))[0].pattern == "pat_lb"
+    found = list(Pounds.iter_quantities("1 lb 2 ct"))
+    assert [(f.value, f.pattern) for f in found] == [(Bundle(16, "oz"), "pounds")]
+    assert Pounds.try_quantity("2 ct") == ParseResult(None, REASON_NO_MATCH)
+
+
+def test_compiled_rules_log_the_matching_rule_under_debug(caplog):
+    caplog.set_level(logging.INFO, logger="unitparsing_pkg.prices")
+    assert Bundle(16, "oz") == UnitPrice.quantity("1 lb")
+    assert "regex matches on 'pat_lb'" not in caplog.messages
+
+    caplog.set_level(logging.DEBUG, logger="unitparsing_pkg.prices")
+    assert Bundle(16, "oz") == UnitPrice.quantity("1 lb")
+    assert "regex matches on 'pat_lb'" in caplog.messages
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("Soda - 15-11 Fl Oz cans", "15-11 Fl Oz"),
+        ("Seedless Mini Watermelon - Each", "Each"),
+        ("3 half gal", "3 half gal"),
+        ("half gallon", "half gallon"),
+        ("3 1/2 pt", "3 1/2 pt"),
+        ("  LB   ", "LB"),
+        ("Adams 16 fl oz", "16 fl oz"),
+        ("fl oz", "fl oz"),
+    ],
+)
+def test_iter_quantities_span_starts_at_the_quantity(test_input, expected):
+    found = next(UnitPrice.iter_quantities(test_input))
+    assert test_input[slice(*found.span)] == expected
+
+
+@pytest.mark.parametrize(
+    "test_input,expected",
+    [
+        ("Organic™ 4 ct / 15.25 oz", "4 ct / 15.25 oz"),
+        ("İ 2 lb", "2 lb"),
+        ("1 ½ lb", "1 ½ lb"),
+        ("Pine​ Nuts ½ lb", "½ lb"),
+        ("１２ ＯＺ", "１２ ＯＺ"),
+        ("Soda – 15–11 Fl Oz cans", "15–11 Fl Oz"),
+    ],
+)
+def test_iter_quantities_span_indexes_noisy_title(test_input, expected):
+    found = next(UnitPrice.iter_quantities(test_input))
+    assert test_input[slice(*found.span)] == expected
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    # runs of spaces are collapsed only for non-ASCII text, which can change
+    # the match itself
+    [t for t, _ in test_quantity_parameter_list if "  " not in t],
+)
+def test_iter_quantities_noisy_spans_match_clean_spans(test_input):
+    noisy = _noisy(test_input)
+    clean = [test_input[slice(*f.span)] for f in UnitPrice.iter_quantities(test_input)]
+    found = [noisy[slice(*f.span)] for f in UnitPrice.iter_quantities(noisy)]
+    assert [normalize(f) for f in found] == [c.lower() for c in clean]
@@ -0,0 +1,160 @@
+"""
+Arrow and pandas integration for UnitPrice.
+
+pyarrow is optional, install with ``pip install unitparsing-pkg-mtmonacelli[arrow]``.
+
+>>> import pyarrow as pa
+>>> from unitparsing_pkg.arrow import quantity_array
+>>> quantity_array(pa.array(["1/2 / lb", None])).to_pylist()
+[{'amount': 8.0, 'unit': 'oz', 'status': 'ok'}, None]
+"""
+
+import logging
+
+from unitparsing_pkg.prices import UnitPrice
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pragma: no cover
+    pa = None
+    pc = None
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
+logger = logging.getLogger(__name__)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for unitparsing_pkg.arrow, "
+            "install with 'pip install unitparsing-pkg-mtmonacelli[arrow]'"
+        )
+
+
+def result_type():
+    """struct<amount: double, unit: string, status: string>"""
+    _require_pyarrow()
+    return pa.struct(
+        [
+            ("amount", pa.float64()),
+            ("unit", pa.string()),
+            ("status", pa.string()),
+        ]
+    )
+
+
+def _quantity(text):
+    result = UnitPrice.try_quantity(text)
+    if not result.ok:
+        return None, None, result.reason
+    return float(result.value.amount), result.value.unit, result.reason
+
+
+def _unit_price(text):
+    result = UnitPrice.try_unit_price(text)
+    if not result.ok:
+        return None, None, result.reason
+    amount, unit = result.value
+    return float(amount), unit, result.reason
+
+
+def _map_chunk(fn, chunk):
+    """
+    Parse each distinct value of a string chunk once and take the results back
+    out through the dictionary indices, so nulls stay in the validity bitmap
+    and repeated titles cost a single parse.
+    """
+    if not pa.types.is_dictionary(chunk.type):
+        chunk = pc.dictionary_encode(chunk)
+
+    amounts, units, statuses = [], [], []
+    for text in chunk.dictionary.to_pylist():
+        amount, unit, status = fn(text)
+        amounts.append(amount)
+        units.append(unit)
+        statuses.append(status)
+
+    parsed = pa.StructArray.from_arrays(
+        [
+            pa.array(amounts, pa.float64()),
+            pa.array(units, pa.string()),
+            pa.array(statuses, pa.string()),
+        ],
+        fields=list(result_type()),
+    )
+    logger.debug(f"parsed {len(parsed)} distinct values for {len(chunk)} rows")
+    return pc.take(parsed, chunk.indices)
+
+
+def _map(fn, values):
+    _require_pyarrow()
+    if isinstance(values, pa.ChunkedArray):
+        return pa.chunked_array(
+            [_map_chunk(fn, c) for c in values.chunks], type=result_type()
+        )
+    if not isinstance(values, pa.Array):
+        values = pa.array(values, pa.string())
+    return _map_chunk(fn, values)
+
+
+def quantity_array(values):
+    """
+    UnitPrice.quantity over an Arrow string array, returns a struct array of
+    amount/unit/status, status being the ParseResult reason code.  Null inputs
+    give null rows.
+    """
+    return _map(_quantity, values)
+
+
+def unit_price_array(values):
+    """
+    UnitPrice.unit_price over an Arrow string array, returns a struct array of
+    amount/unit/status, status being the ParseResult reason code.  Null inputs
+    give null rows.
+    """
+    return _map(_unit_price, values)
+
+
+if pd is not None and pa is not None:
+
+    @pd.api.extensions.register_series_accessor("unitparse")
+    class UnitParseAccessor:
+        """df["title"].unitparse.quantity(), df["price"].unitparse.unit_price()"""
+
+        def __init__(self, series):
+            self._series = series
+
+        def _wrap(self, result):
+            return pd.Series(
+                result,
+                dtype=pd.ArrowDtype(result_type()),
+                index=self._series.index,
+                name=self._series.name,
+            )
+
+        def _values(self):
+            return pa.array(self._series, from_pandas=True)
+
+        def quantity(self):
+            return self._wrap(quantity_array(self._values()))
+
+        def unit_price(self):
+            return self._wrap(unit_price_array(self._values()))
+
+    @pd.api.extensions.register_dataframe_accessor("unitparse")
+    class UnitParseFrameAccessor:
+        """df.unitparse.quantity("title"), df.unitparse.unit_price("price")"""
+
+        def __init__(self, frame):
+            self._frame = frame
+
+        def quantity(self, column):
+            return self._frame[column].unitparse.quantity()
+
+        def unit_price(self, column):
+            return self._frame[column].unitparse.unit_price()
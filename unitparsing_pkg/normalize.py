@@ -0,0 +1,121 @@
+"""
+Fold scraped-title noise into lowercase ASCII before the patterns see it.
+
+>>> normalize("Farms™ Organic\\u00a0Pine Nuts, ４\\u2009OZ")
+'farms organic pine nuts, 4 oz'
+>>> normalize("1½ lb"), normalize("1 ½ lb"), normalize("½ lb")
+('1.5 lb', '1.5 lb', '.5 lb')
+"""
+
+import re
+
+# unicode fractions with a terminating decimal, "1½" and "1 ½" become "1.5"
+FRACTIONS = {
+    "½": ".5",
+    "¼": ".25",
+    "¾": ".75",
+    "⅛": ".125",
+    "⅜": ".375",
+    "⅝": ".625",
+    "⅞": ".875",
+    "⅕": ".2",
+    "⅖": ".4",
+    "⅗": ".6",
+    "⅘": ".8",
+    "⅒": ".1",
+}
+
+SPACES = (
+    "\t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\x85\xa0\u1680"
+    "\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000"
+)
+
+# zero width characters, soft hyphen and trademark-ish symbols
+DELETE = "\xad\u200b\u200c\u200d\u2060\ufeff™®©℠"
+
+DASHES = "\u2010\u2011\u2012\u2013\u2014\u2015\u2212"
+
+SLASHES = "\u2044\u2215"
+
+
+def _table():
+    table = {ord(c): " " for c in SPACES}
+    table.update({ord(c): None for c in DELETE})
+    table.update({ord(c): "-" for c in DASHES})
+    table.update({ord(c): "/" for c in SLASHES})
+    # fullwidth ！ through ～ onto ! through ~
+    table.update({c: c - 0xFEE0 for c in range(0xFF01, 0xFF5F)})
+    return table
+
+
+TABLE = _table()
+
+pat_spaces = re.compile(" {2,}")
+
+# a fraction and the whole number before it, read as one mixed number
+pat_fraction = re.compile(f"(?:(\\d+) *)?([{''.join(FRACTIONS)}])")
+
+
+def _decimal(match):
+    return (match.group(1) or "") + FRACTIONS[match.group(2)]
+
+
+def normalize(text):
+    """
+    Lowercase text, and for non-ASCII text fold unicode spaces, dashes,
+    fraction slashes and fullwidth characters to ASCII, drop zero width
+    characters and ™/®/©, turn mixed numbers like "2 ½" into "2.5", then
+    collapse runs of spaces.
+    """
+    if text.isascii():
+        return text.lower()
+
+    text = text.translate(TABLE).lower()
+    text = pat_fraction.sub(_decimal, text)
+    if "  " in text:
+        text = pat_spaces.sub(" ", text)
+    return text
+
+
+def normalize_offsets(text):
+    """
+    normalize(text) along with, for each index of the result, the index of
+    text it came from, so spans found in the normalized text can be mapped
+    back to the caller's text.  Slower than normalize, for iter_quantities.
+
+    >>> normalize_offsets("A™ 1 ½ lb")
+    ('a 1.5 lb', [0, 2, 3, 5, 5, 6, 7, 8])
+    """
+    if text.isascii():
+        return text.lower(), range(len(text))
+
+    chars, offsets = [], []
+    for i, c in enumerate(text):
+        folded = c.translate(TABLE).lower()
+        chars.append(folded)
+        offsets.extend([i] * len(folded))
+    folded = "".join(chars)
+
+    chars, kept, last = [], [], 0
+    for match in pat_fraction.finditer(folded):
+        chars.append(folded[last : match.start()])
+        kept.extend(offsets[last : match.start()])
+        if match.group(1):
+            chars.append(match.group(1))
+            kept.extend(offsets[match.start(1) : match.end(1)])
+        decimal = FRACTIONS[match.group(2)]
+        chars.append(decimal)
+        kept.extend([offsets[match.start(2)]] * len(decimal))
+        last = match.end()
+    chars.append(folded[last:])
+    kept.extend(offsets[last:])
+    folded = "".join(chars)
+
+    chars, offsets = [], []
+    for c, i in zip(folded, kept):
+        if c == " " and chars and chars[-1] == " ":
+            continue
+        chars.append(c)
+        offsets.append(i)
+    return "".join(chars), offsets
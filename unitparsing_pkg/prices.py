@@ -10,11 +10,14 @@ True
 >>>
 """
 
+import collections
 import fractions
 import logging
-import pprint
+import random
 import re
 
+from unitparsing_pkg.normalize import normalize, normalize_offsets
+
 
 class ParseQuantityException(Exception):
     """Base class for other exceptions"""
@@ -41,6 +44,103 @@ class Bundle:
         return False
 
 
+REASON_OK = "ok"
+REASON_NO_MATCH = "no_match"
+REASON_NOT_STRING = "not_string"
+REASON_UNKNOWN_UNIT = "unknown_unit"
+REASON_BAD_NUMBER = "bad_number"
+
+
+class ParseResult(collections.namedtuple("ParseResult", ["value", "reason"])):
+    """
+    Outcome of try_quantity/try_unit_price, value is None unless reason is 'ok'
+
+    >>> UnitPrice.try_quantity("10 oz").ok
+    True
+    """
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        return self.reason == REASON_OK
+
+
+class QuantityMatch(collections.namedtuple("QuantityMatch", ["value", "span", "pattern"])):
+    """A quantity found by UnitPrice.iter_quantities"""
+
+    __slots__ = ()
+
+
+class QuantityRule(
+    collections.namedtuple(
+        "QuantityRule",
+        [
+            "name",
+            "pattern",
+            "priority",
+            "unit",
+            "unit_group",
+            "number",
+            "qty",
+            "number_default",
+            "qty_default",
+            "multiplier",
+        ],
+        defaults=[None, None, None, None, None, None, 1],
+    )
+):
+    """
+    One quantity pattern as data: the amount is number * qty * multiplier,
+    number and qty being the named groups (or their defaults when the group
+    is empty), and the unit is either fixed or looked up from unit_group in
+    UnitPrice.quantity_units.  Lower priority is tried first.
+    """
+
+    __slots__ = ()
+
+
+class UnitConversion(
+    collections.namedtuple(
+        "UnitConversion", ["names", "unit", "factor", "divide"], defaults=[False]
+    )
+):
+    """Spellings in names become unit, multiplying by factor (or dividing)"""
+
+    __slots__ = ()
+
+
+class FailureSample:
+    """
+    Bounded reservoir sample of inputs that failed to parse
+
+    >>> failures = FailureSample(2)
+    >>> _ = UnitPrice.try_quantities(["1 lb", "junk", "1/2/lb", "more junk"], failures)
+    >>> failures.seen
+    3
+    >>> len(failures.items)
+    2
+    """
+
+    def __init__(self, size=100, seed=None):
+        self.size = size
+        self.seen = 0
+        self.items = []
+        self._random = random.Random(seed)
+
+    def add(self, text, reason):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append((text, reason))
+            return
+        i = self._random.randrange(self.seen)
+        if i < self.size:
+            self.items[i] = (text, reason)
+
+    def __repr__(self):
+        return f"FailureSample(size={self.size!r}, seen={self.seen!r})"
+
+
 class UnitPrice:
     logger = logging.getLogger(__name__)
 
@@ -61,7 +161,7 @@ class UnitPrice:
         \s*
         (?:pack|pk)\b
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 1/2 oz
@@ -72,10 +172,10 @@ class UnitPrice:
         (?P<qty>[\.\d/]*)
         \s*
         (?:
-        FL.OZs?\b | OZs?\b | ounces?\b
+        fl.ozs?\b | ozs?\b | ounces?\b
         )
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 3.4 Fl Oz
@@ -84,11 +184,11 @@ class UnitPrice:
         .*?
         (?P<qty>[\.\d]+)
         \s*
-        Fl\.?
+        fl\.?
         \s*
-        \bOZ\b
+        \boz\b
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # - 15-11 Fl Oz cans
@@ -103,11 +203,11 @@ class UnitPrice:
         \s*
         (?P<qty>[\.\d]+)
         \s*
-        Fl\.?
+        fl\.?
         \s*
-        OZ\b
+        oz\b
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 3 cans / 23 fl oz
@@ -117,15 +217,15 @@ class UnitPrice:
         .*?
         (?P<num>[\.\d]+)
         \s*
-        (?:cans?|ct|Count)
+        (?:cans?|ct|count)
         \s*
         /
         \s*
         (?P<qty>[\.\d]+)
         \s*
-        Fl.*?OZ
+        fl.*?oz
         \b""",
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 3 half gal
@@ -134,12 +234,12 @@ class UnitPrice:
         .*?
         (?P<qty>[\.\d]+)?
         \s*
-        Half
+        half
         \s*
-        (?:Gallon|Gal)
+        (?:gallon|gal)
         \b
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     pat_multi = re.compile(
@@ -157,7 +257,7 @@ class UnitPrice:
         | gal\b | gallons?\b
         )
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # no number, assume 1
@@ -166,12 +266,12 @@ class UnitPrice:
         [^\d\.]*
         \s*
         (?P<unit>
-          LBs?\b | pounds?\b
-          | OZs?\b | ounces?\b
+          lbs?\b | pounds?\b
+          | ozs?\b | ounces?\b
           | gals?\b | gallons?\b
         )
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # each
@@ -180,9 +280,9 @@ class UnitPrice:
         .*?
         [^\d\.]?
         \s*
-        \bEach\b
+        \beach\b
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 10 bunch
@@ -196,7 +296,7 @@ class UnitPrice:
         bunch
         \b
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 4 ct / 15.25 oz
@@ -213,11 +313,11 @@ class UnitPrice:
         \s*
         (?P<qty>[\.\d/]+)
         \s*
-        (FL\.?)?
+        (fl\.?)?
         \s*
-        OZ\b
+        oz\b
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 3ea
@@ -233,9 +333,9 @@ class UnitPrice:
         \s*
         /?
         \s*
-        (?:Each|ea)
+        (?:each|ea)
         \b""",
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 3 Count
@@ -247,9 +347,9 @@ class UnitPrice:
         \s*
         /?
         \s*
-        (?:Count|ct)
+        (?:count|ct)
         \b""",
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
     )
 
     # 3 lb
@@ -264,12 +364,62 @@ class UnitPrice:
         /?
         \s*
         (?:
-        LBs?\b | pounds?\b
+        lbs?\b | pounds?\b
         )
         """,
-        re.IGNORECASE | re.VERBOSE,
+        re.VERBOSE,
+    )
+
+    quantity_units = (
+        UnitConversion(("pt", "pint", "pints"), "oz", OZ_PER_PINT),
+        UnitConversion(
+            ("ml", "mls", "milliliter", "milliliters"), "oz", ML_PER_OZ, divide=True
+        ),
+        UnitConversion(("qt", "qts", "quart", "quarts"), "oz", OZ_PER_QUART),
+        UnitConversion(
+            ("fl.gal", "flgal", "gal", "gals", "gallon", "gallons"), "oz", OZ_PER_GAL
+        ),
+        UnitConversion(("lb", "lbs", "pound", "pounds"), "oz", OZ_PER_LB),
+        UnitConversion(("fl.oz", "floz", "oz", "ozs", "ounce", "ounces"), "oz", 1),
+    )
+
+    # the first rule, by priority, that matches anywhere in the text wins
+    quantity_rules = (
+        QuantityRule("pat_oz_4", pat_oz_4, 10, "oz", number="num", qty="qty"),
+        QuantityRule(
+            "pat_multi",
+            pat_multi,
+            20,
+            unit_group="unit",
+            number="num",
+            qty="qty",
+            number_default="1",
+            qty_default="1",
+        ),
+        QuantityRule("pat_no_number_multi", pat_no_number_multi, 30, unit_group="unit"),
+        QuantityRule("pat_bunch", pat_bunch, 40, "bunch", qty="qty"),
+        QuantityRule("pat_can", pat_can, 50, "oz", number="num", qty="qty"),
+        QuantityRule("pat_count", pat_count, 60, "count", qty="qty"),
+        QuantityRule("pat_each", pat_each, 70, "each", qty="qty"),
+        QuantityRule(
+            "pat_gallon_2",
+            pat_gallon_2,
+            80,
+            "oz",
+            qty="qty",
+            qty_default="1",
+            multiplier=0.5 * OZ_PER_GAL,
+        ),
+        QuantityRule("pat_lb", pat_lb, 90, "oz", qty="qty", multiplier=OZ_PER_LB),
+        QuantityRule("pat_oz_3", pat_oz_3, 100, "oz", qty="qty"),
+        QuantityRule("pat_oz_2", pat_oz_2, 110, "oz", qty="qty", qty_default="1"),
+        QuantityRule("pat_oz_5", pat_oz_5, 120, "oz", number="num", qty="qty"),
+        QuantityRule("pat_each_2", pat_each_2, 130, "each"),
+        QuantityRule("pat_pack", pat_pack, 140, "pack", qty="qty"),
     )
 
+    _compiled_quantity = None
+
     pat_unit_price = re.compile(
         r"""
         .*?
@@ -295,7 +445,7 @@ class UnitPrice:
         | \bpint\b | \bpt\b
         )
         """,
-        flags=re.IGNORECASE | re.VERBOSE,
+        flags=re.VERBOSE,
     )
 
     @classmethod
@@ -322,11 +472,9 @@ class UnitPrice:
         return qty, unit
 
     @classmethod
-    def unit_price(cls, text):
-        cls.logger.debug(f"matching on {text}'")
-        orig = text
+    def _unit_price(cls, text):
         text = str(text)  # text might not be string, could be float, int
-        text = text.lower()
+        text = normalize(text)
 
         if match := re.match(cls.pat_unit_price, text):
             cls.logger.debug("matched pat_unit_price")
@@ -344,136 +492,328 @@ class UnitPrice:
             cls.logger.debug(f"{dollars=},{qty=},{unit=}")
             qty, unit = cls._convert_oz(dollars / qty, unit)
             cls.logger.debug(f"{qty}/{unit}")
-            return (qty, unit)
+            return ParseResult((qty, unit), REASON_OK)
+        return ParseResult(None, REASON_NO_MATCH)
+
+    @classmethod
+    def unit_price(cls, text):
+        cls.logger.debug(f"matching on {text}'")
+        result = cls._unit_price(text)
+        if result.ok:
+            return result.value
         raise CaculateUnitPriceException(
-            f"can't generate unit price from text '{orig}'"
+            f"can't generate unit price from text '{text}'"
         )
 
     @classmethod
-    def doit(cls, number, qty, unit):
+    def try_unit_price(cls, text):
+        """
+        Like unit_price but returns a ParseResult instead of raising
+
+        >>> UnitPrice.try_unit_price("5.49 / oz")
+        ParseResult(value=(5.49, 'oz'), reason='ok')
+        >>> UnitPrice.try_unit_price(" / oz")
+        ParseResult(value=None, reason='no_match')
+        """
+        try:
+            return cls._unit_price(text)
+        except (ValueError, ZeroDivisionError):
+            return ParseResult(None, REASON_BAD_NUMBER)
+
+    @classmethod
+    def try_unit_prices(cls, texts, failures=None):
+        """try_unit_price over texts, misses are offered to failures"""
+        return _try_many(cls.try_unit_price, texts, failures)
+
+    @classmethod
+    def _doit(cls, number, qty, unit):
         unit = unit.lower().strip()
         cls.logger.debug(f"{unit=}")
-        if unit in ["pt", "pint", "pints"]:
-            result = Bundle(number * qty * cls.OZ_PER_PINT, "oz")
-        elif unit in ["ml", "mls", "milliliter", "milliliters"]:
-            result = Bundle(number * qty / cls.ML_PER_OZ, "oz")
-        elif unit in ["qt", "qts", "quart", "quarts"]:
-            result = Bundle(number * qty * cls.OZ_PER_QUART, "oz")
-        elif unit in ["fl.gal", "flgal", "gal", "gals", "gallon", "gallons"]:
-            result = Bundle(number * qty * cls.OZ_PER_GAL, "oz")
-        elif unit in ["lb", "lbs", "pound", "pounds"]:
-            result = Bundle(number * qty * cls.OZ_PER_LB, "oz")
-        elif unit in ["fl.oz", "floz", "oz", "ozs", "ounce", "ounces"]:
-            result = Bundle(number * qty, "oz")
-        else:
+        for conversion in cls.quantity_units:
+            if unit in conversion.names:
+                amount = number * qty
+                if conversion.divide:
+                    amount /= conversion.factor
+                elif conversion.factor != 1:
+                    amount *= conversion.factor
+                return ParseResult(Bundle(amount, conversion.unit), REASON_OK)
+
+        return ParseResult(None, REASON_UNKNOWN_UNIT)
+
+    @classmethod
+    def doit(cls, number, qty, unit):
+        result = cls._doit(number, qty, unit)
+        if not result.ok:
             raise ValueError("something went wrong with pat_pint_quart parsing")
 
-        return result
+        return result.value
+
+    @classmethod
+    def _compile(cls):
+        """
+        quantity_rules compiled by _compile_quantity, once per class so a
+        subclass overriding the rules gets its own parse function and scanner
+        """
+        compiled = cls.__dict__.get("_compiled_quantity")
+        if compiled is None:
+            compiled = _compile_quantity(
+                cls.quantity_rules, cls.quantity_units, normalize, cls.logger
+            )
+            cls._compiled_quantity = compiled
+            cls.logger.debug(f"compiled quantity rules:\n{compiled[0].source}")
+        return compiled
+
+    @classmethod
+    def _quantity(cls, text):
+        return cls._compile()[0](text)
 
     @classmethod
     def quantity(cls, text):
-        def frac(str_):
-            """ 1/2 to 0.5 """
-            return float(sum(fractions.Fraction(s) for s in str_.split()))
+        result = cls._quantity(text)
+        if result.ok:
+            return result.value
 
         text = "" if text is None else text
+        if result.reason == REASON_NOT_STRING:
+            raise ParseQuantityException(
+                f"I'm expecting a string for text '{text}' but faound a {type(text)} instead"
+            )
+        if result.reason == REASON_UNKNOWN_UNIT:
+            raise ValueError("something went wrong with pat_pint_quart parsing")
+        raise ParseQuantityException(f"can't match quantity on string '{text}'")
+
+    @classmethod
+    def try_quantity(cls, text):
+        """
+        Like quantity but returns a ParseResult instead of raising
+
+        >>> UnitPrice.try_quantity("1/2 / lb")
+        ParseResult(value=Bundle(8.0, 'oz'), reason='ok')
+        >>> UnitPrice.try_quantity("1.3 easter egg")
+        ParseResult(value=None, reason='no_match')
+        >>> UnitPrice.try_quantity("1/2/lb")
+        ParseResult(value=None, reason='bad_number')
+        """
+        try:
+            return cls._quantity(text)
+        except (ValueError, ZeroDivisionError):
+            return ParseResult(None, REASON_BAD_NUMBER)
 
+    @classmethod
+    def try_quantities(cls, texts, failures=None):
+        """try_quantity over texts, misses are offered to failures"""
+        return _try_many(cls.try_quantity, texts, failures)
+
+    @classmethod
+    def iter_quantities(cls, text):
+        """
+        Lazily yield every quantity in text, left to right, in a single scan.
+        At each position the rules are tried in priority order, so
+        the first value can differ from quantity() when a later pattern matches
+        earlier in the text.  Matches whose numbers don't parse are skipped.
+        The scan runs on normalize(text) and spans are mapped back to index
+        the text as given.
+
+        >>> list(UnitPrice.iter_quantities("4 ct / 15.25 oz 5 ct / 15.25 oz"))
+        [QuantityMatch(value=Bundle(61.0, 'oz'), span=(0, 15), pattern='pat_can'), QuantityMatch(value=Bundle(76.25, 'oz'), span=(16, 31), pattern='pat_can')]
+        """
+        if text is None:
+            return
         if not isinstance(text, str):
-            pf = pprint.pformat(text)
             raise ParseQuantityException(
                 f"I'm expecting a string for text '{text}' but faound a {type(text)} instead"
             )
 
-        result = None
-        if match := re.match(cls.pat_oz_4, text):
-            cls.logger.debug("regex matches on 'pat_oz_4'")
-            qty = frac(match.group("qty"))
-            number = float(match.group("num"))
-            result = Bundle(qty * number, "oz")
-
-        elif match := re.match(cls.pat_multi, text):
-            cls.logger.debug("regex matches on 'pat_multi'")
-
-            number_pre = match.group("num") or "1"
-            cls.logger.debug(f"{number_pre=}")
-            number = float(frac(number_pre))
-
-            qty_pre = match.group("qty") or "1"
-            cls.logger.debug(f"{number=},{qty_pre=}")
-            qty = float(frac(qty_pre))
-
-            unit = match.group("unit").strip()
-            return cls.doit(number, qty, unit)
-
-        elif match := re.match(cls.pat_no_number_multi, text):
-            cls.logger.debug("regex matches on 'pat_no_number_multi'")
-            number = 1
-            qty = 1
-            unit = match.group("unit").strip()
-            return cls.doit(number, qty, unit)
-
-        elif match := re.match(cls.pat_bunch, text):
-            cls.logger.debug("regex matches on 'pat_bunch'")
-            qty = frac(match.group("qty"))
-            result = Bundle(qty, "bunch")
-
-        elif match := re.match(cls.pat_can, text):
-            cls.logger.debug("regex matches on 'pat_can'")
-            qty = frac(match.group("qty"))
-            number = frac(match.group("num"))
-            result = Bundle(qty * number, "oz")
-
-        elif match := re.match(cls.pat_count, text):
-            cls.logger.debug("regex matches on 'pat_count'")
-            qty = frac(match.group("qty"))
-            result = Bundle(qty, "count")
-
-        elif match := re.match(cls.pat_each, text):
-            cls.logger.debug("regex matches on 'pat_each'")
-            qty = frac(match.group("qty"))
-            result = Bundle(qty, "each")
-
-        elif match := re.match(cls.pat_gallon_2, text):
-            cls.logger.debug("regex matches on 'pat_gallon_2'")
-            qty = frac(match.group("qty") or "1")
-            result = Bundle(qty * 0.5 * cls.OZ_PER_GAL, "oz")
-
-        elif match := re.match(cls.pat_lb, text):
-            cls.logger.debug("regex matches on 'pat_lb'")
-            qty = frac(match.group("qty"))
-            result = Bundle(qty * cls.OZ_PER_LB, "oz")
-
-        elif match := re.match(cls.pat_oz_3, text):
-            cls.logger.debug("regex matches on 'pat_oz_3'")
-            qty = frac(match.group("qty"))
-            result = Bundle(qty, "oz")
-
-        elif match := re.match(cls.pat_oz_2, text):
-            cls.logger.debug("regex matches on 'pat_oz_2'")
-            qty_pre = match.group("qty") or "1"
-            cls.logger.debug(f"{qty_pre=}")
-            qty = frac(qty_pre)
-            result = Bundle(qty, "oz")
-
-        elif match := re.match(cls.pat_oz_5, text):
-            cls.logger.debug("regex matches on 'pat_oz_5'")
-            qty = frac(match.group("qty"))
-            number = float(match.group("num"))
-            result = Bundle(qty * number, "oz")
-
-        elif match := re.match(cls.pat_each_2, text):
-            cls.logger.debug("regex matches on 'pat_each_2'")
-            result = Bundle(1, "each")
-
-        elif match := re.match(cls.pat_pack, text):
-            cls.logger.debug("regex matches on 'pat_pack'")
-            qty = frac(match.group("qty"))
-            result = Bundle(qty, "pack")
+        text, offsets = normalize_offsets(text)
+        _, converters, scanner = cls._compile()
+        for scan in scanner.finditer(text):
+            name = scan.lastgroup
+            start, end = scan.span()
+            pattern, convert = converters[name]
+            match = pattern.match(text, start, end)
+            if match is None:
+                continue
+            try:
+                result = convert(match)
+            except (ValueError, ZeroDivisionError):
+                continue
+            if result.ok:
+                span = (offsets[_span_start(match)], offsets[end - 1] + 1)
+                yield QuantityMatch(result.value, span, name)
 
+    @classmethod
+    def all_quantities(cls, texts):
+        """iter_quantities over texts, one list of QuantityMatch per text"""
+        return [list(cls.iter_quantities(text)) for text in texts]
+
+
+def _span_start(match):
+    """
+    Where the quantity itself starts: the first named group that matched
+    something, or the first word character when none did, so separators the
+    pattern consumes ('\\s+-\\s+', '[^\\d\\.]?') stay out of the span.
+    """
+    starts = [
+        match.start(g) for g in match.groupdict() if match.end(g) > match.start(g)
+    ]
+    if starts:
+        return min(starts)
+    word = pat_word.search(match.string, match.pos, match.endpos)
+    return word.start() if word else match.pos
+
+
+pat_word = re.compile(r"\w")
+
+
+def _number(str_):
+    """ 1/2 to 0.5, plain decimals skip the Fraction round trip """
+    if "/" in str_:
+        return float(sum(fractions.Fraction(s) for s in str_.split()))
+    return float(str_)
+
+
+def _rule_source(rule, units, normalized):
+    """
+    Body of one rule's conversion, reading groups off the match m.  Unit
+    groups of normalized text are already lowercase without padding.
+    """
+    lines = []
+    factors = []
+    for group, default in (
+        (rule.number, rule.number_default),
+        (rule.qty, rule.qty_default),
+    ):
+        if group is None:
+            continue
+        if default is None:
+            factors.append(f"_number(g({group!r}))")
         else:
-            raise ParseQuantityException(f"can't match quantity on string '{text}'")
-
-        return result
+            factors.append(f"_number(g({group!r}) or {default!r})")
+    amount = " * ".join(factors) or "1"
+    if rule.multiplier != 1:
+        amount = f"{amount} * {rule.multiplier!r}"
+    if factors or rule.unit_group:
+        lines.append("g = m.group")
+
+    if rule.unit_group is None:
+        lines.append(f"return _ParseResult(_Bundle({amount}, {rule.unit!r}), {REASON_OK!r})")
+        return lines
+
+    lines.append(f"amount = {amount}")
+    if normalized:
+        lines.append(f"unit = g({rule.unit_group!r})")
+    else:
+        lines.append(f"unit = g({rule.unit_group!r}).lower().strip()")
+    for conversion in units:
+        if conversion.divide:
+            converted = f"amount / {conversion.factor!r}"
+        elif conversion.factor != 1:
+            converted = f"amount * {conversion.factor!r}"
+        else:
+            converted = "amount"
+        names = ", ".join(repr(n) for n in conversion.names)
+        lines.append(f"if unit in {{{names}}}:")
+        lines.append(
+            f"    return _ParseResult(_Bundle({converted}, {conversion.unit!r}), {REASON_OK!r})"
+        )
+    lines.append("return _UNKNOWN_UNIT")
+    return lines
+
+
+def _compile_quantity(rules, units, normalize=None, logger=None):
+    """
+    Generate and exec a parse function for rules: text goes through normalize
+    (when given), then each rule's pattern.match is bound to a default
+    argument, tried in priority order, and its conversion inlined with the
+    multipliers and unit spellings as constants.
+    With a logger each rule logs "regex matches on '<name>'" as the
+    hand-written cascade did, behind a runtime isEnabledFor(DEBUG) check.
+    Also generates one converter per rule for iter_quantities.  Returns the
+    parse function (with its source on .source), {name: (pattern, convert)}
+    and the _scanner for rules.
+    """
+    rules = sorted(rules, key=lambda r: r.priority)
+    namespace = {
+        "_number": _number,
+        "_Bundle": Bundle,
+        "_ParseResult": ParseResult,
+        "_isinstance": isinstance,
+        "_str": str,
+        "_NOT_STRING": ParseResult(None, REASON_NOT_STRING),
+        "_NO_MATCH": ParseResult(None, REASON_NO_MATCH),
+        "_UNKNOWN_UNIT": ParseResult(None, REASON_UNKNOWN_UNIT),
+        "_normalize": normalize,
+        "_logger": logger,
+    }
+    bound = ", ".join(f"{k}={k}" for k in namespace)
+
+    src = []
+    for i, rule in enumerate(rules):
+        namespace[f"_match_{i}"] = rule.pattern.match
+        src.append(f"def _convert_{i}(m, {bound}):")
+        src.extend(f"    {line}" for line in _rule_source(rule, units, normalize is not None))
+        src.append("")
+
+    matches = ", ".join(f"_match_{i}=_match_{i}" for i in range(len(rules)))
+    src.append(f"def _quantity(text, {matches}, {bound}):")
+    src.append("    if text is None:")
+    src.append('        text = ""')
+    src.append("    elif not _isinstance(text, _str):")
+    src.append("        return _NOT_STRING")
+    if normalize is not None:
+        src.append("    text = _normalize(text)")
+    for i, rule in enumerate(rules):
+        src.append(f"    # {rule.name}")
+        src.append(f"    m = _match_{i}(text)")
+        src.append("    if m is not None:")
+        if logger is not None:
+            src.append(f"        if _logger.isEnabledFor({logging.DEBUG}):")
+            src.append(
+                f"            _logger.debug({f'regex matches on {rule.name!r}'!r})"
+            )
+        src.extend(f"        {line}" for line in _rule_source(rule, units, normalize is not None))
+    src.append("    return _NO_MATCH")
+
+    source = "\n".join(src) + "\n"
+    exec(compile(source, "<quantity_rules>", "exec"), namespace)
+
+    parse = namespace["_quantity"]
+    parse.source = source
+    converters = {
+        rule.name: (rule.pattern, namespace[f"_convert_{i}"])
+        for i, rule in enumerate(rules)
+    }
+    return parse, converters, _scanner(rules)
+
+
+def _scanner(rules):
+    """
+    All rules joined into one alternation, each wrapped in a group named
+    after its pattern with the inner groups prefixed so the names don't
+    collide.  The leading '.*?' (or '[^\\d\\.]*') of each pattern is
+    dropped so finditer can walk the text once.  Flags are those of the
+    rule patterns.
+    """
+    alternatives = []
+    for rule in rules:
+        body = re.sub(r"^\s*(?:\.\*\?|\[\^\\d\\\.\]\*)", "", rule.pattern.pattern)
+        body = re.sub(r"\(\?P<(\w+)>", rf"(?P<{rule.name}__\1>", body)
+        alternatives.append(f"(?P<{rule.name}>{body})")
+    flags = re.VERBOSE
+    for rule in rules:
+        flags |= rule.pattern.flags
+    return re.compile("|".join(alternatives), flags)
+
+
+def _try_many(fn, texts, failures):
+    results = []
+    append = results.append
+    for text in texts:
+        result = fn(text)
+        if failures is not None and not result.ok:
+            failures.add(text, result.reason)
+        append(result)
+    return results
 
 
 if __name__ == "__main__":